@@ -1,12 +1,46 @@
+import argparse
+import hashlib
+import io
+import json
+import mmap
 import os
+import re
+import shutil
+import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, Union, List
+from typing import Dict, Optional, Set, Tuple, Union, List
 
-from PIL import Image, ImageDraw, ImageFont, ImageColor
+from PIL import Image, ImageDraw, ImageFont, ImageColor, features
 
 
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+_SUPPORTED_FS = frozenset(SUPPORTED_EXTENSIONS)
+JPEG_EXTENSIONS = {".jpg", ".jpeg"}
+EXIF_CACHE_FILENAME = ".exif_cache.json"
+# Pass 2 rewrites the cache after this many saved images, so rendered
+# signatures survive a run that is killed before its final save
+EXIF_CACHE_SAVE_EVERY = 50
+
+RGBAColor = Tuple[int, int, int, int]
+# Exif APP1 sits right after SOI (and maybe APP0); one segment is at most 64 KiB
+APP1_SCAN_LIMIT = 64 * 1024
+
+_DATE_RE = re.compile(rb"^\s*(\d{4})[:\-](\d{2})[:\-](\d{2})")
+
+_JPEG_SEGMENT = struct.Struct(">HH")
+# Per byte order: TIFF header (magic, IFD0 offset), IFD entry count, IFD entry, u32
+_TIFF_STRUCTS = {
+    endian: (
+        struct.Struct(endian + "HI"),
+        struct.Struct(endian + "H"),
+        struct.Struct(endian + "HHI4s"),
+        struct.Struct(endian + "I"),
+    )
+    for endian in ("<", ">")
+}
 
 
 def prompt_user_inputs() -> Tuple[Path, bool, int, str, str]:
@@ -67,14 +101,21 @@ def ensure_output_dir(original_dir: Path) -> Path:
     return out_dir
 
 
-def list_images_in_dir(directory: Path):
-    for entry in directory.iterdir():
-        if entry.is_file() and entry.suffix.lower() in SUPPORTED_EXTENSIONS:
-            yield entry
+def list_images_in_dir(directory: Path) -> List[Tuple[Path, os.stat_result]]:
+    """List supported images as (path, stat) pairs; each file is stat'd exactly once."""
+    images = []
+    # DirEntry.is_file() is answered from the directory listing for regular files
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            dot = name.rfind(".")
+            # dot > 0 matches Path.suffix, which ignores leading-dot names
+            if dot > 0 and name[dot:].lower() in _SUPPORTED_FS and entry.is_file():
+                images.append((Path(entry.path), entry.stat()))
+    return images
 
 
-def try_load_truetype_font(font_size: int) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
-    """Try to load a TTF font; fallback to default bitmap font if unavailable."""
+def _find_font_paths() -> Tuple[str, ...]:
     # Common Windows font
     candidate_paths = [
         Path("C:/Windows/Fonts/arial.ttf"),
@@ -82,10 +123,27 @@ def try_load_truetype_font(font_size: int) -> Union[ImageFont.FreeTypeFont, Imag
         Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
         Path("/Library/Fonts/Arial.ttf"),
     ]
+    existing = []
     for font_path in candidate_paths:
         try:
             if font_path.exists():
-                return ImageFont.truetype(str(font_path), font_size)
+                existing.append(str(font_path))
+        except OSError:
+            continue
+    return tuple(existing)
+
+
+# Resolved once at import instead of probing the filesystem on every load;
+# all existing candidates are kept, in order, in case one fails to load
+_FONT_PATHS = _find_font_paths()
+
+
+@lru_cache(maxsize=8)
+def try_load_truetype_font(font_size: int) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
+    """Try to load a TTF font; fallback to default bitmap font if unavailable."""
+    for font_path in _FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, font_size)
         except Exception:
             continue
     try:
@@ -94,52 +152,247 @@ def try_load_truetype_font(font_size: int) -> Union[ImageFont.FreeTypeFont, Imag
         return ImageFont.load_default()
 
 
-def extract_exif_date(image: Image.Image) -> Optional[str]:
-    """Extract date string (YYYY-MM-DD) from EXIF DateTimeOriginal or DateTime."""
-    # Prefer Pillow >=7's getexif()
-    exif = None
+def warn_if_slow_jpeg_codec() -> None:
+    """Print a hint when Pillow's JPEG codec is not backed by libjpeg-turbo."""
     try:
-        exif = image.getexif()
+        turbo = features.check_feature("libjpeg_turbo")
     except Exception:
-        pass
+        return
+    if turbo is False:
+        print("提示：当前 Pillow 未使用 libjpeg-turbo，JPEG 编解码会较慢；建议安装官方 Pillow 轮子或 Pillow-SIMD。")
+
 
-    date_value = None
-    if exif:
-        # 36867: DateTimeOriginal, 306: DateTime
-        for tag in (36867, 306):
-            value = exif.get(tag)
+def _read_jpeg_app1(buf: memoryview) -> Optional[Tuple[int, int]]:
+    """Locate the TIFF payload of the JPEG Exif APP1 segment in `buf`.
+
+    Returns:
+        (start, end) offsets of the payload, or None if there is no Exif APP1.
+        Raises ValueError on a malformed stream so callers can fall back to Pillow.
+    """
+    if buf[:2] != b"\xff\xd8":
+        raise ValueError("missing JPEG SOI marker")
+    pos = 2
+    while True:
+        marker, length = _JPEG_SEGMENT.unpack_from(buf, pos)
+        if marker >> 8 != 0xFF:
+            raise ValueError("corrupt JPEG marker")
+        if marker == 0xFFDA:
+            # SOS: entropy-coded data follows, no metadata beyond this point
+            return None
+        if length < 2:
+            raise ValueError("invalid JPEG segment length")
+        start, end = pos + 10, pos + 2 + length
+        # APP1 is also used for XMP; keep scanning if this one is not Exif
+        if marker == 0xFFE1 and buf[pos + 4:start] == b"Exif\x00\x00":
+            if end > len(buf):
+                raise ValueError("APP1 segment exceeds the scanned window")
+            return start, end
+        pos = end
+
+
+def _parse_tiff_datetime(buf: memoryview, base: int, end: int) -> Optional[bytes]:
+    """Find DateTimeOriginal (Exif IFD) or DateTime (IFD0) in the TIFF block buf[base:end].
+
+    Returns the raw ASCII value, e.g. b"YYYY:MM:DD HH:MM:SS\\x00".
+    """
+    # Copy slices out: a live memoryview slice (e.g. held by a traceback frame)
+    # would keep the mmap exported and make closing it raise BufferError
+    byte_order = bytes(buf[base:base + 2])
+    if byte_order == b"II":
+        endian = "<"
+    elif byte_order == b"MM":
+        endian = ">"
+    else:
+        raise ValueError("invalid TIFF byte order")
+    header, count_struct, entry_struct, u32 = _TIFF_STRUCTS[endian]
+    magic, ifd0_offset = header.unpack_from(buf, base + 2)
+    if magic != 42:
+        raise ValueError("invalid TIFF magic")
+
+    def _read_ifd(offset: int) -> Dict[int, Tuple[int, int, bytes]]:
+        # 12-byte entries: tag u16, type u16, count u32, value/offset u32
+        pos = base + offset
+        (count,) = count_struct.unpack_from(buf, pos)
+        if pos + 2 + 12 * count > end:
+            raise ValueError("EXIF IFD out of range")
+        entries = {}
+        for entry_pos in range(pos + 2, pos + 2 + 12 * count, 12):
+            tag, typ, n, value = entry_struct.unpack_from(buf, entry_pos)
+            entries[tag] = (typ, n, value)
+        return entries
+
+    def _read_date(entry: Tuple[int, int, bytes]) -> Optional[bytes]:
+        typ, n, value = entry
+        # Only ASCII values long enough to hold "YYYY:MM:DD"
+        if typ != 2 or n < 10:
+            return None
+        start = base + u32.unpack(value)[0]
+        if start + n > end:
+            raise ValueError("EXIF value out of range")
+        return bytes(buf[start:start + n])
+
+    ifd0 = _read_ifd(ifd0_offset)
+    # 34665: ExifOffset -> 36867: DateTimeOriginal
+    if 34665 in ifd0:
+        exif_ifd = _read_ifd(u32.unpack(ifd0[34665][2])[0])
+        if 36867 in exif_ifd:
+            value = _read_date(exif_ifd[36867])
             if value:
-                date_value = str(value)
-                break
+                return value
+    # 306: DateTime
+    if 306 in ifd0:
+        return _read_date(ifd0[306])
+    return None
 
-    if not date_value:
-        # Fallback to legacy _getexif
+
+def _read_jpeg_exif_datetime(img_path: Path, size: Optional[int] = None) -> Optional[bytes]:
+    """Read the EXIF date of a JPEG by mapping only its first APP1_SCAN_LIMIT bytes.
+
+    `size` is the file size if the caller already stat'd the file.
+    """
+    with open(img_path, "rb") as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size < 4:
+            raise ValueError("file too small to be a JPEG")
+        with mmap.mmap(f.fileno(), min(APP1_SCAN_LIMIT, size), access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buf:
+                tiff_range = _read_jpeg_app1(buf)
+                if tiff_range is None:
+                    return None
+                return _parse_tiff_datetime(buf, *tiff_range)
+
+
+def _read_exif_datetime_pil(image: Image.Image) -> Optional[str]:
+    """Read raw DateTimeOriginal/DateTime through Pillow's EXIF support."""
+    # getexif() parses once and is cached on the image by Pillow
+    try:
+        exif = image.getexif()
+        # 34665: Exif IFD holding 36867 DateTimeOriginal; 306: DateTime in IFD0
+        value = exif.get_ifd(34665).get(36867) or exif.get(306)
+    except Exception:
+        return None
+    return str(value) if value else None
+
+
+def extract_exif_date(
+    img_path: Path,
+    image: Optional[Image.Image] = None,
+    size: Optional[int] = None,
+) -> Optional[str]:
+    """Extract date string (YYYY-MM-DD) from EXIF DateTimeOriginal or DateTime.
+
+    JPEGs are parsed straight from the APP1 segment without opening an Image;
+    PNGs only use EXIF already attached by Image.open, so the file is never
+    streamed just to look for a trailing eXIf chunk. `size` is the file size
+    from an earlier stat, if known.
+    """
+    suffix = img_path.suffix.lower()
+    date_value: Union[str, bytes, None] = None
+    parsed = False
+    if suffix in JPEG_EXTENSIONS:
         try:
-            raw = image._getexif()  # type: ignore[attr-defined]
-            if raw and isinstance(raw, dict):
-                for tag in (36867, 306):
-                    if tag in raw and raw[tag]:
-                        date_value = str(raw[tag])
-                        break
-        except Exception:
+            date_value = _read_jpeg_exif_datetime(img_path, size)
+            parsed = True
+        except (OSError, ValueError, UnicodeDecodeError, struct.error, BufferError):
             pass
 
+    if not parsed:
+        if image is None:
+            with Image.open(img_path) as opened:
+                if suffix == ".png" and "exif" not in opened.info:
+                    return None
+                date_value = _read_exif_datetime_pil(opened)
+        elif suffix == ".png" and "exif" not in image.info:
+            return None
+        else:
+            date_value = _read_exif_datetime_pil(image)
+
     if not date_value:
         return None
+    if isinstance(date_value, str):
+        date_value = date_value.encode("ascii", "ignore")
+
+    # "YYYY:MM:DD HH:MM:SS" (or YYYY-MM-DD); EXIF fields are already zero-padded
+    m = _DATE_RE.match(date_value)
+    if not m:
+        return None
+    return f"{m.group(1).decode()}-{m.group(2).decode()}-{m.group(3).decode()}"
+
+
+@lru_cache(maxsize=None)
+def _exif_date_for_stat(path_str: str, mtime_ns: int, size: int) -> Optional[str]:
+    # mtime_ns/size are part of the key so a modified file is parsed again
+    return extract_exif_date(Path(path_str), size=size)
+
 
-    # Common EXIF datetime format: "YYYY:MM:DD HH:MM:SS"
+def _exif_cache_load(out_dir: Path) -> Dict[str, dict]:
+    """Load the persistent EXIF date cache stored in the output directory."""
     try:
-        date_part = date_value.split(" ")[0]
-        yyyy, mm, dd = date_part.split(":")
-        return f"{int(yyyy):04d}-{int(mm):02d}-{int(dd):02d}"
-    except Exception:
-        # Try alternative format YYYY-MM-DD HH:MM:SS
-        try:
-            date_part = date_value.split(" ")[0]
-            yyyy, mm, dd = date_part.split("-")
-            return f"{int(yyyy):04d}-{int(mm):02d}-{int(dd):02d}"
-        except Exception:
-            return None
+        with open(out_dir / EXIF_CACHE_FILENAME, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _exif_cache_save(out_dir: Path, cache: Dict[str, dict], src_dir: Path, seen: Set[str]) -> None:
+    """Write the EXIF date cache back; failures only cost a re-parse next run.
+
+    Entries for files that no longer exist in `src_dir` are dropped; names in
+    `seen` were just scanned, so only the others are checked on disk.
+    """
+    cache = {
+        name: entry
+        for name, entry in cache.items()
+        # Path(name).name == name also discards keys from older path-keyed caches
+        if name in seen or (Path(name).name == name and (src_dir / name).exists())
+    }
+    cache_path = out_dir / EXIF_CACHE_FILENAME
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        # Write then rename, so a run killed mid-save keeps the previous cache
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def get_exif_date_cached(
+    img_path: Path,
+    st: Optional[os.stat_result] = None,
+    cache: Optional[Dict[str, dict]] = None,
+) -> Optional[str]:
+    """extract_exif_date() with a {mtime_ns, size} -> date cache in front of it.
+
+    `st` is the file's stat result if the caller already has one. Entries in
+    `cache` (as loaded by _exif_cache_load) are keyed by file name, since the
+    cache lives in that directory's output folder, and are reused while the
+    file is unchanged; misses are parsed and written back into `cache`.
+    """
+    if st is None:
+        st = img_path.stat()
+    key = img_path.name
+    if cache is not None:
+        entry = cache.get(key)
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            return entry.get("date")
+
+    date_text = _exif_date_for_stat(str(img_path), st.st_mtime_ns, st.st_size)
+    if cache is not None:
+        cache[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "date": date_text}
+    return date_text
+
+
+def _render_signature(entry: dict, font_size: int, color: RGBAColor, position_key: str, date_text: str) -> str:
+    """Hash of everything that determines an output image, for skipping re-runs."""
+    key = f"{entry['mtime_ns']}|{entry['size']}|{font_size}|{color}|{position_key}|{date_text}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def compute_position(
@@ -169,70 +422,157 @@ def compute_position(
     return margin, margin
 
 
+@lru_cache(maxsize=64)
+def _measure_text(font: ImageFont.ImageFont, text: str) -> Tuple[int, int]:
+    """Width/height of `text` without stroke; cached since a batch has few distinct dates."""
+    scratch = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    # Prefer modern APIs when available
+    if hasattr(scratch, "textbbox"):
+        try:
+            left, top, right, bottom = scratch.textbbox((0, 0), text, font=font)
+            return right - left, bottom - top
+        except Exception:
+            pass
+    # Pillow >=8 font.getbbox
+    if hasattr(font, "getbbox"):
+        try:
+            left, top, right, bottom = font.getbbox(text)
+            return right - left, bottom - top
+        except Exception:
+            pass
+    # Legacy fallbacks
+    if hasattr(font, "getsize"):
+        try:
+            return font.getsize(text)  # type: ignore[return-value]
+        except Exception:
+            pass
+    # Last resort
+    return (100, 30)
+
+
+@lru_cache(maxsize=None)
+def _make_sprite(
+    text: str,
+    font: ImageFont.ImageFont,
+    fill_color: RGBAColor,
+    stroke_width: int = 2,
+) -> Tuple[Image.Image, Tuple[int, int], Tuple[int, int]]:
+    """Render the stroked text once onto a tight transparent RGBA tile.
+
+    Returns:
+        sprite: 文字图块
+        offset: 图块相对于文字绘制原点的偏移
+        text_size: 不含描边的文字宽高，用于计算位置
+    """
+    text_size = _measure_text(font, text)
+    scratch = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+    # Ink extent including the stroke; falls back to a padded text box
+    try:
+        left, top, right, bottom = scratch.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+    except Exception:
+        left, top = -stroke_width, -stroke_width
+        right, bottom = text_size[0] + stroke_width, text_size[1] + stroke_width
+
+    sprite = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    # Optional stroke for readability
+    try:
+        draw.text((-left, -top), text, font=font, fill=fill_color, stroke_width=stroke_width, stroke_fill="black")
+    except TypeError:
+        # Older Pillow without stroke
+        draw.text((-left, -top), text, font=font, fill=fill_color)
+    return sprite, (left, top), text_size
+
+
 def draw_text_watermark(
     image: Image.Image,
     text: str,
     font: ImageFont.ImageFont,
-    fill_color: str,
+    fill_color: RGBAColor,
     position_key: str,
 ) -> Image.Image:
-    # Convert to RGBA to support semi-transparent stroke if needed
-    if image.mode != "RGBA":
+    """Paste the cached text sprite onto the image and return the result.
+
+    RGB/L/RGBA images are modified in place, so the caller hands over
+    ownership of `image` (pass a copy to keep the original); other modes are
+    converted to RGBA, which is returned as-is and saved in that mode.
+    """
+    if image.mode in ("RGB", "L", "RGBA"):
+        base = image
+    else:
         base = image.convert("RGBA")
+
+    sprite, (offset_x, offset_y), text_size = _make_sprite(text, font, fill_color)
+    x, y = compute_position(base.size, text_size, position_key)
+    dest_x, dest_y = x + offset_x, y + offset_y
+    if base.mode == "RGBA":
+        # paste() would blend the alpha channel too and leave translucent
+        # fringes around the glyphs; alpha_composite keeps opaque areas opaque
+        source = (max(-dest_x, 0), max(-dest_y, 0))
+        base.alpha_composite(sprite, (max(dest_x, 0), max(dest_y, 0)), source)
     else:
-        base = image.copy()
-
-    draw = ImageDraw.Draw(base)
-
-    def _measure_text() -> Tuple[int, int]:
-        # Prefer modern APIs when available
-        if hasattr(draw, "textbbox"):
-            try:
-                left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
-                return right - left, bottom - top
-            except Exception:
-                pass
-        # Pillow >=8 font.getbbox
-        if hasattr(font, "getbbox"):
-            try:
-                left, top, right, bottom = font.getbbox(text)
-                return right - left, bottom - top
-            except Exception:
-                pass
-        # Legacy fallbacks
-        if hasattr(font, "getsize"):
-            try:
-                return font.getsize(text)  # type: ignore[return-value]
-            except Exception:
-                pass
-        # Last resort
-        return (100, 30)
-
-    text_w, text_h = _measure_text()
-    x, y = compute_position(base.size, (text_w, text_h), position_key)
+        # The sprite's alpha doubles as the paste mask, so translucent fills blend
+        base.paste(sprite, (dest_x, dest_y), sprite)
+    return base
 
-    # Optional stroke for readability
-    try:
-        draw.text((x, y), text, font=font, fill=fill_color, stroke_width=2, stroke_fill="black")
-    except TypeError:
-        # Older Pillow without stroke
-        draw.text((x, y), text, font=font, fill=fill_color)
 
-    # Return with original mode if necessary
-    if image.mode != "RGBA":
-        return base.convert(image.mode)
-    return base
+def _save_watermarked(image: Image.Image, img_path: Path, output_dir: Path) -> Path:
+    out_path = output_dir / img_path.name
+    # Preserve format
+    save_kwargs = {}
+    if img_path.suffix.lower() in JPEG_EXTENSIONS:
+        save_format = "JPEG"
+        # Baseline 4:2:0 without an extra Huffman pass is libjpeg-turbo's fastest encode
+        save_kwargs.update(quality=95, optimize=False, progressive=False, subsampling=2)
+        # JPEG has no alpha channel
+        if image.mode == "RGBA":
+            image = image.convert("RGB")
+    else:
+        save_format = "PNG"
+
+    # Encode in memory, then write the file in one call instead of many small writes
+    buf = io.BytesIO()
+    image.save(buf, format=save_format, **save_kwargs)
+    out_path.write_bytes(buf.getbuffer())
+    return out_path
+
+
+def _process_one(
+    img_path: Path,
+    date_text: str,
+    font_size: int,
+    color: RGBAColor,
+    position_key: str,
+    output_dir: Path,
+) -> Tuple[Path, Optional[str]]:
+    """Decode, watermark, encode and write a single image in a worker process.
+
+    Returns:
+        (img_path, error)，成功时 error 为 None，否则为失败说明
+    """
+    try:
+        with Image.open(img_path) as img:
+            # Decode once here; everything after works on the loaded pixels
+            img.load()
+            # Fonts (and the sprites keyed on them) are cached per worker process
+            font = try_load_truetype_font(font_size)
+            watermarked = draw_text_watermark(img, date_text, font, color, position_key)
+            _save_watermarked(watermarked, img_path, output_dir)
+    except Exception as exc:
+        return img_path, f"（{exc.__class__.__name__}）：{exc}"
+    return img_path, None
 
 
 def process_targets(
     base_dir: Path,
-    targets: List[Path],
+    targets: List[Tuple[Path, os.stat_result]],
     font_size: int,
-    color: str,
+    color: RGBAColor,
     position_key: str,
+    copy_skipped: bool = False,
 ) -> None:
     output_dir = ensure_output_dir(base_dir)
-    font = try_load_truetype_font(font_size)
 
     if not targets:
         print("未发现可处理的图片（jpg/jpeg/png）。")
@@ -241,36 +581,94 @@ def process_targets(
     processed = 0
     skipped = 0
     skipped_reasons: dict[str, int] = {}
-    for img_path in targets:
+    # Report lines are written with a single stdout write at the end
+    lines: List[str] = []
+
+    # Pass 1: metadata only. JPEG dates come from APP1 without Image.open and
+    # are cached, so images without a date never reach the decode pass.
+    exif_cache = _exif_cache_load(output_dir)
+    pending: List[Tuple[Path, str]] = []
+    signatures: Dict[Path, str] = {}
+    for img_path, st in targets:
         try:
-            with Image.open(img_path) as img:
-                date_text = extract_exif_date(img)
-                if not date_text:
-                    reason = "无拍摄时间"
-                    print(f"跳过（{reason}）：{img_path.name}")
-                    skipped_reasons[reason] = skipped_reasons.get(reason, 0) + 1
-                    skipped += 1
-                    continue
-
-                watermarked = draw_text_watermark(img, date_text, font, color, position_key)
-
-                out_path = output_dir / img_path.name
-                # Preserve format
-                save_kwargs = {}
-                if img_path.suffix.lower() in {".jpg", ".jpeg"}:
-                    save_kwargs["quality"] = 95
-
-                watermarked.save(out_path, **save_kwargs)
-                processed += 1
-                print(f"已保存：{out_path}")
+            date_text = get_exif_date_cached(img_path, st, exif_cache)
         except Exception as exc:
-            print(f"处理失败 {img_path.name}（{exc.__class__.__name__}）：{exc}")
+            lines.append(f"处理失败 {img_path.name}（{exc.__class__.__name__}）：{exc}")
+            continue
+        if not date_text:
+            reason = "无拍摄时间"
+            if copy_skipped:
+                try:
+                    # copyfile already uses sendfile (Linux) / fcopyfile (macOS)
+                    shutil.copyfile(img_path, output_dir / img_path.name)
+                    lines.append(f"跳过（{reason}，已复制原图）：{img_path.name}")
+                except Exception as exc:
+                    lines.append(f"复制失败 {img_path.name}（{exc.__class__.__name__}）：{exc}")
+            else:
+                lines.append(f"跳过（{reason}）：{img_path.name}")
+            skipped_reasons[reason] = skipped_reasons.get(reason, 0) + 1
+            skipped += 1
+            continue
 
-    if skipped_reasons:
-        reasons_str = "；".join([f"{k} {v} 张" for k, v in skipped_reasons.items()])
-        print(f"完成。处理成功 {processed} 张，跳过 {skipped} 张（原因：{reasons_str}）。输出目录：{output_dir}")
-    else:
-        print(f"完成。处理成功 {processed} 张，跳过 {skipped} 张。输出目录：{output_dir}")
+        # Same source file and same settings as a previous successful run
+        entry = exif_cache[img_path.name]
+        sig = _render_signature(entry, font_size, color, position_key, date_text)
+        if entry.get("rendered_sig") == sig and (output_dir / img_path.name).exists():
+            reason = "未变化"
+            lines.append(f"跳过（{reason}）：{img_path.name}")
+            skipped_reasons[reason] = skipped_reasons.get(reason, 0) + 1
+            skipped += 1
+            continue
+        signatures[img_path] = sig
+        pending.append((img_path, date_text))
+
+    # Pass 2: decode, draw, encode and write in worker processes. Processes,
+    # not threads: drawing, the RGBA composite and PNG encoding hold the GIL.
+    # Each worker holds one decoded image at a time, so memory stays at about
+    # one image per worker. max_workers=None lets the executor pick cpu_count,
+    # capped at 61 on Windows where a larger value raises ValueError.
+    # The finally block keeps the report and cache on Ctrl-C or a broken pool.
+    seen = {img_path.name for img_path, _ in targets}
+    try:
+        if pending:
+            with ProcessPoolExecutor(max_workers=None) as executor:
+                futures = {
+                    executor.submit(_process_one, img_path, date_text, font_size, color, position_key, output_dir): img_path
+                    for img_path, date_text in pending
+                }
+                for future in as_completed(futures):
+                    try:
+                        img_path, error = future.result()
+                    except Exception as exc:
+                        # e.g. BrokenProcessPool when a worker is killed
+                        img_path, error = futures[future], f"（{exc.__class__.__name__}）：{exc}"
+                    if error is None:
+                        processed += 1
+                        exif_cache[img_path.name]["rendered_sig"] = signatures[img_path]
+                        lines.append(f"已保存：{output_dir / img_path.name}")
+                        if processed % EXIF_CACHE_SAVE_EVERY == 0:
+                            _exif_cache_save(output_dir, exif_cache, base_dir, seen)
+                    else:
+                        lines.append(f"处理失败 {img_path.name}{error}")
+
+        if skipped_reasons:
+            reasons_str = "；".join([f"{k} {v} 张" for k, v in skipped_reasons.items()])
+            lines.append(f"完成。处理成功 {processed} 张，跳过 {skipped} 张（原因：{reasons_str}）。输出目录：{output_dir}")
+        else:
+            lines.append(f"完成。处理成功 {processed} 张，跳过 {skipped} 张。输出目录：{output_dir}")
+    finally:
+        _exif_cache_save(output_dir, exif_cache, base_dir, seen)
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
+
+def parse_color(color: str) -> RGBAColor:
+    """Parse a color name/hex once into an (r, g, b, a) tuple for drawing."""
+    rgb = ImageColor.getrgb(color)
+    if len(rgb) == 3:
+        return rgb + (255,)  # type: ignore[return-value]
+    return rgb  # type: ignore[return-value]
 
 
 def normalize_color_input(user_input: str) -> str:
@@ -310,22 +708,31 @@ POSITION_CN_TO_KEY = {
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="为图片添加 EXIF 拍摄日期水印。")
+    parser.add_argument(
+        "--copy-skipped",
+        action="store_true",
+        help="将没有拍摄时间的图片原样复制到输出目录",
+    )
+    args = parser.parse_args()
+
+    warn_if_slow_jpeg_codec()
     path, is_dir, font_size, color_input, position_cn = prompt_user_inputs()
     position_key = POSITION_CN_TO_KEY.get(position_cn, "center")
-    color = normalize_color_input(color_input)
+    fill_rgba = parse_color(normalize_color_input(color_input))
 
     if is_dir:
         base_dir = path
-        targets = list(list_images_in_dir(base_dir))
+        targets = list_images_in_dir(base_dir)
     else:
         base_dir = path.parent
-        targets = [path] if path.suffix.lower() in SUPPORTED_EXTENSIONS else []
+        targets = [(path, path.stat())] if path.suffix.lower() in SUPPORTED_EXTENSIONS else []
 
     if not targets and not is_dir:
         print("输入的文件扩展名不受支持（仅支持 jpg/jpeg/png）。")
         return
 
-    process_targets(base_dir, targets, font_size, color, position_key)
+    process_targets(base_dir, targets, font_size, fill_rgba, position_key, copy_skipped=args.copy_skipped)
 
 
 if __name__ == "__main__":